@@ -18,6 +18,7 @@ Requires:       python3
 Requires:       python3-pyyaml >= 6.0
 Requires:       bootc
 Requires:       sudo
+Recommends:     python3-orjson
 
 %description
 EOL Rebaser automatically detects when a bootc container image has reached
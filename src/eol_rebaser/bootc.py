@@ -3,8 +3,28 @@
 import json
 import logging
 import os
+import re
+import shutil
 import subprocess
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Union
+
+_json_loads: Callable[[Union[str, bytes]], Any]
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# [registry[:port]/]name[/name...][:tag][@sha256:digest]
+_IMAGE_REF_RE = re.compile(
+    r"[\w.\-]+(?::\d+)?(?:/[\w.\-]+)*(?::[\w.\-]+)?(?:@sha256:[0-9a-f]{64})?"
+)
+
+
+def _decode_output(output: Optional[bytes]) -> str:
+    """Decode captured subprocess output for logging and error checks."""
+    return output.decode(errors="replace") if output else ""
 
 
 logger = logging.getLogger(__name__)
@@ -21,23 +41,46 @@ class BootcManager:
         """
         self.use_sudo = use_sudo
         self.bootc_cmd = ["sudo", "bootc"] if use_sudo else ["bootc"]
+        self._status_cache: Optional[Dict[str, Any]] = None
 
-    def get_current_image(self) -> Optional[str]:
-        """Get the currently booted container image.
+    def _get_status(self, refresh: bool = False) -> Dict[str, Any]:
+        """Get parsed ``bootc status`` output, running the command at most once.
+
+        Args:
+            refresh: Discard any cached status and query bootc again
 
         Returns:
-            Current container image name or None if not found
+            Parsed bootc status dictionary
+
+        Raises:
+            FileNotFoundError: If bootc is not installed
+            subprocess.CalledProcessError: If bootc status fails
+            json.JSONDecodeError: If bootc status output is not valid JSON
         """
-        try:
+        if self._status_cache is None or refresh:
+            # Don't spawn sudo (and possibly prompt for a password) just to
+            # find out that bootc isn't there
+            if shutil.which("bootc") is None:
+                raise FileNotFoundError("bootc command not found")
+
             result = subprocess.run(
                 self.bootc_cmd + ["status", "--json"],
                 capture_output=True,
-                text=True,
                 check=True,
                 timeout=30,
             )
+            self._status_cache = _json_loads(result.stdout)
+
+        return self._status_cache
 
-            status_data = json.loads(result.stdout)
+    def get_current_image(self) -> Optional[str]:
+        """Get the currently booted container image.
+
+        Returns:
+            Current container image name or None if not found
+        """
+        try:
+            status_data = self._get_status()
 
             if "spec" in status_data and "image" in status_data["spec"]:
                 image = status_data["spec"]["image"]["image"]
@@ -48,13 +91,14 @@ class BootcManager:
                 return None
 
         except subprocess.CalledProcessError as e:
-            if "root user" in str(e.stderr) or "root privilege" in str(e.stderr):
+            stderr = _decode_output(e.stderr)
+            if "root user" in stderr or "root privilege" in stderr:
                 logger.error(
                     "bootc requires root privileges. Make sure you have sudo access or run as root."
                 )
             else:
                 logger.error(f"Failed to get bootc status: {e}")
-                logger.error(f"Command output: {e.stderr}")
+                logger.error(f"Command output: {stderr}")
             return None
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse bootc status JSON: {e}")
@@ -89,24 +133,24 @@ class BootcManager:
             result = subprocess.run(
                 self.bootc_cmd + ["switch", new_image],
                 capture_output=True,
-                text=True,
                 timeout=1200,  # 20 minute timeout for rebase
             )
 
             if result.returncode == 0:
                 logger.info("Rebase completed successfully")
-                logger.info(f"stdout: {result.stdout}")
+                # The staged deployment changed, so the cached status is stale
+                self._status_cache = None
+                logger.info(f"stdout: {_decode_output(result.stdout)}")
                 return True
             else:
-                if "root user" in str(result.stderr) or "root privilege" in str(
-                    result.stderr
-                ):
+                stderr = _decode_output(result.stderr)
+                if "root user" in stderr or "root privilege" in stderr:
                     logger.error(
                         "bootc requires root privileges. Make sure you have sudo access or run as root."
                     )
                 else:
                     logger.error(f"Rebase failed with return code {result.returncode}")
-                    logger.error(f"stderr: {result.stderr}")
+                    logger.error(f"stderr: {stderr}")
                 return False
 
         except subprocess.TimeoutExpired:
@@ -125,13 +169,7 @@ class BootcManager:
         Returns:
             True if image reference appears valid, False otherwise
         """
-        # Basic validation - ensure it looks like a container image reference
         if not image:
             return False
 
-        # Should contain at least a registry/name or name:tag format
-        if "/" in image or ":" in image:
-            return True
-
-        # Simple name might be valid too
-        return len(image.strip()) > 0
+        return _IMAGE_REF_RE.fullmatch(image.strip()) is not None
@@ -2,21 +2,407 @@
 
 import logging
 import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from re import _parser as sre_parse  # type: ignore[attr-defined]
+from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore[assignment]
+
 
 logger = logging.getLogger(__name__)
 
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+# Group references in a to_image template: \1 or \g<name>
+_GROUP_REF_RE = re.compile(r"\\(?:(\d+)|g<([^>]*)>)")
+_REPEAT_OPS = (
+    sre_parse.MAX_REPEAT,
+    sre_parse.MIN_REPEAT,
+    sre_parse.POSSESSIVE_REPEAT,
+)
+
+# Character sets are a membership test plus the characters they name
+_CharSet = Tuple[Callable[[str], bool], FrozenSet[str]]
+_NO_CHARS: _CharSet = (lambda ch: False, frozenset())
+_ANY_CHAR: _CharSet = (lambda ch: True, frozenset())
+# Characters tried when checking whether two classes like \w and [^/] overlap
+_SAMPLE_CHARS = frozenset("aZ0_-./:@+ \t\n\u00e9")
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: re.compile(r"\d"),
+    sre_parse.CATEGORY_NOT_DIGIT: re.compile(r"\D"),
+    sre_parse.CATEGORY_SPACE: re.compile(r"\s"),
+    sre_parse.CATEGORY_NOT_SPACE: re.compile(r"\S"),
+    sre_parse.CATEGORY_WORD: re.compile(r"\w"),
+    sre_parse.CATEGORY_NOT_WORD: re.compile(r"\W"),
+}
+
+
+def _extract_literal_prefix(pattern: str) -> str:
+    """Get the literal text that every match of a regex pattern starts with.
+
+    This is deliberately conservative: it stops at the first character that
+    is not a plain or escaped literal (or that is quantified), and returns an
+    empty prefix for patterns using alternation.
+
+    Args:
+        pattern: Regular expression pattern
+
+    Returns:
+        Literal prefix of the pattern, possibly empty
+    """
+    if "|" in pattern:
+        return ""
+
+    prefix = []
+    i = 1 if pattern.startswith("^") else 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            # Escapes like \d, \w or \1 aren't literals
+            if not escaped or escaped.isalnum():
+                break
+            char = escaped
+            i += 2
+        elif char in _REGEX_METACHARS:
+            break
+        else:
+            i += 1
+
+        # A quantified character may not appear in the match at all
+        if pattern[i : i + 1] in ("*", "?", "{"):
+            break
+        prefix.append(char)
+
+    return "".join(prefix)
+
+
+def _subpattern_children(op: Any, av: Any) -> List[Any]:
+    """Get the nested subpatterns of a parsed regex element.
+
+    Args:
+        op: Opcode of the element
+        av: Arguments of the element
+
+    Returns:
+        Subpatterns the element contains, if any
+    """
+    if op in _REPEAT_OPS:
+        return [av[2]]
+    if op is sre_parse.SUBPATTERN:
+        return [av[3]]
+    if op is sre_parse.BRANCH:
+        return list(av[1])
+    if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return [av[1]]
+    if op is sre_parse.ATOMIC_GROUP:
+        return [av]
+    if op is sre_parse.GROUPREF_EXISTS:
+        return [child for child in av[1:] if child is not None]
+    return []
+
+
+def _char_set(
+    predicate: Callable[[str], bool], samples: Iterable[str] = ()
+) -> _CharSet:
+    """Build a character set from a membership test and characters it names."""
+    return predicate, frozenset(samples)
+
+
+def _union(first: _CharSet, second: _CharSet) -> _CharSet:
+    """Get the union of two character sets."""
+    return _char_set(lambda ch: first[0](ch) or second[0](ch), first[1] | second[1])
+
+
+def _overlaps(first: _CharSet, second: _CharSet) -> bool:
+    """Check whether two character sets share a character.
+
+    Membership is only tested for the characters either set names plus a few
+    representative ones, which is enough for the classes image patterns use.
+    """
+    candidates = first[1] | second[1] | _SAMPLE_CHARS
+    return any(first[0](ch) and second[0](ch) for ch in candidates)
+
+
+def _class_char_set(items: Any) -> _CharSet:
+    """Get the character set of a parsed ``[...]`` class or escape like ``\\w``."""
+    negate = False
+    ranges: List[Tuple[int, int]] = []
+    categories: List["re.Pattern[str]"] = []
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            ranges.append((av, av))
+        elif op is sre_parse.RANGE:
+            ranges.append(av)
+        elif op is sre_parse.CATEGORY and av in _CATEGORIES:
+            categories.append(_CATEGORIES[av])
+        else:
+            return _ANY_CHAR
+
+    def predicate(ch: str) -> bool:
+        code = ord(ch)
+        found = any(lo <= code <= hi for lo, hi in ranges) or any(
+            category.fullmatch(ch) for category in categories
+        )
+        return found != negate
+
+    return _char_set(predicate, (chr(code) for bounds in ranges for code in bounds))
+
+
+def _first_chars(subpattern: Any) -> Tuple[_CharSet, bool]:
+    """Get the characters a parsed pattern can start with.
+
+    Args:
+        subpattern: Parsed pattern, or a list of its elements
+
+    Returns:
+        The set of possible first characters, and whether the pattern can
+        match the empty string
+    """
+    first = _NO_CHARS
+    for op, av in subpattern:
+        if op is sre_parse.LITERAL:
+            return _union(first, _class_char_set([(op, av)])), False
+        if op is sre_parse.NOT_LITERAL:
+            chars = _class_char_set([(sre_parse.NEGATE, None), (sre_parse.LITERAL, av)])
+            return _union(first, chars), False
+        if op is sre_parse.ANY:
+            return _ANY_CHAR, False
+        if op is sre_parse.IN:
+            return _union(first, _class_char_set(av)), False
+
+        if op in _REPEAT_OPS:
+            chars, nullable = _first_chars(av[2])
+            nullable = nullable or av[0] == 0
+        elif op in (sre_parse.BRANCH, sre_parse.GROUPREF_EXISTS):
+            chars, nullable = _NO_CHARS, op is sre_parse.GROUPREF_EXISTS
+            for child in _subpattern_children(op, av):
+                child_chars, child_nullable = _first_chars(child)
+                chars = _union(chars, child_chars)
+                nullable = nullable or child_nullable
+        elif op in (sre_parse.SUBPATTERN, sre_parse.ATOMIC_GROUP):
+            chars, nullable = _first_chars(_subpattern_children(op, av)[0])
+        elif op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            continue
+        else:
+            # Backreferences and anything else unusual could match anything
+            return _ANY_CHAR, True
+
+        first = _union(first, chars)
+        if not nullable:
+            return first, False
+
+    return first, True
+
+
+def _is_ambiguous(subpattern: Any, follow: _CharSet) -> bool:
+    """Check whether part of a repeated body can match text in several ways.
+
+    That is the case when a variable-length repeat can also consume the
+    characters that follow it, or when alternatives can start with the same
+    character. Possessive repeats and atomic groups never give back what they
+    matched, so they are not looked into.
+
+    Args:
+        subpattern: Parsed pattern, or a list of its elements
+        follow: Characters that can come right after the pattern
+
+    Returns:
+        True if the pattern is ambiguous
+    """
+    elements = list(subpattern)
+    for index, (op, av) in enumerate(elements):
+        rest, rest_nullable = _first_chars(elements[index + 1 :])
+        after = _union(rest, follow) if rest_nullable else rest
+
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            body_first, _ = _first_chars(av[2])
+            if av[0] != av[1] and _overlaps(body_first, after):
+                return True
+            if _is_ambiguous(av[2], _union(body_first, after) if av[1] > 1 else after):
+                return True
+        elif op is sre_parse.BRANCH:
+            firsts = []
+            for branch in av[1]:
+                if _is_ambiguous(branch, after):
+                    return True
+                chars, nullable = _first_chars(branch)
+                firsts.append(_union(chars, after) if nullable else chars)
+            for i, chars in enumerate(firsts):
+                if any(_overlaps(chars, other) for other in firsts[i + 1 :]):
+                    return True
+        elif op in (sre_parse.SUBPATTERN, sre_parse.GROUPREF_EXISTS):
+            children = _subpattern_children(op, av)
+            if any(_is_ambiguous(child, after) for child in children):
+                return True
+
+    return False
+
+
+def _has_nested_quantifier(subpattern: Any) -> bool:
+    """Check a parsed regex for a repeated group with an ambiguous body.
+
+    Patterns such as ``(.+)+``, ``(\\w+-?)+`` or ``(a|ab|b)*`` can split the
+    same text between iterations in exponentially many ways and backtrack
+    catastrophically on long inputs. Bodies like ``(?:[^/]+/)*``, where a
+    separator leaves only one way to split the text, are fine.
+
+    Args:
+        subpattern: Parsed pattern from ``sre_parse.parse``
+
+    Returns:
+        True if the pattern contains an ambiguous nested quantifier
+    """
+    for op, av in subpattern:
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[1] > 1:
+            # The next iteration can start right after this one ends
+            body_first, body_nullable = _first_chars(av[2])
+            if body_nullable or _is_ambiguous(av[2], body_first):
+                return True
+        if any(_has_nested_quantifier(child) for child in _subpattern_children(op, av)):
+            return True
+
+    return False
+
+
+def compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compile a migration from_pattern.
+
+    Patterns are matched against the whole image reference with
+    ``fullmatch``; ones with ambiguous nested quantifiers are rejected.
+
+    Args:
+        pattern: Regular expression from a migration's from_pattern
+
+    Returns:
+        Compiled pattern
+
+    Raises:
+        re.error: If the pattern is invalid or prone to catastrophic backtracking
+    """
+    compiled = re.compile(pattern)
+    if _has_nested_quantifier(sre_parse.parse(pattern)):
+        raise re.error("nested quantifiers can cause catastrophic backtracking")
+    return compiled
+
+
+def needs_substitution(template: str) -> bool:
+    """Check whether a to_image template references from_pattern groups.
+
+    Args:
+        template: Target image template
+
+    Returns:
+        True if the template contains group references such as ``\\1``
+    """
+    return _GROUP_REF_RE.search(template) is not None
+
+
+def _check_group_references(compiled: "re.Pattern[str]", template: str) -> None:
+    """Check that a to_image template only references existing groups.
+
+    Args:
+        compiled: Compiled from_pattern
+        template: Target image template
+
+    Raises:
+        re.error: If the template references a group the pattern doesn't have
+    """
+    for number, name in _GROUP_REF_RE.findall(template):
+        ref = number or name
+        if ref.isdigit():
+            if int(ref) > compiled.groups:
+                raise re.error(f"to_image references missing group {ref}")
+        elif ref not in compiled.groupindex:
+            raise re.error(f"to_image references unknown group name '{ref}'")
+
+
+def parse_effective_date(value: str) -> date:
+    """Parse a migration effective_date in YYYY-MM-DD format.
+
+    Args:
+        value: Date string from the configuration
+
+    Returns:
+        Parsed date
+
+    Raises:
+        ValueError: If the value is not a valid date in that format
+    """
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def compile_migration(migration: Dict[str, Any]) -> None:
+    """Precompute the data used to match a migration against images.
+
+    Stores the compiled from_pattern, its literal prefix, the parsed
+    effective_date (or None) and whether to_image needs regex substitution on
+    the migration as ``_compiled_pattern``, ``_literal_prefix``,
+    ``_effective_date`` and ``_needs_substitution``. These are only
+    recomputed when from_pattern, to_image or effective_date changed since
+    the migration was last compiled.
+
+    Args:
+        migration: Migration configuration dictionary
+
+    Raises:
+        ValueError: If from_pattern is missing or effective_date is not a
+            valid date
+        re.error: If from_pattern is not a valid regex, or to_image references
+            groups it doesn't have
+    """
+    if "from_pattern" not in migration:
+        raise ValueError(
+            f"Migration '{migration.get('name', '<unnamed>')}' has no from_pattern"
+        )
+
+    pattern = migration["from_pattern"]
+    template = migration.get("to_image", "")
+    source = (pattern, template, migration.get("effective_date"))
+    if migration.get("_compiled_from") == source:
+        return
+
+    compiled = compile_pattern(pattern)
+
+    substitute = needs_substitution(template)
+    if substitute:
+        _check_group_references(compiled, template)
+
+    effective_date = None
+    if "effective_date" in migration:
+        effective_date = parse_effective_date(migration["effective_date"])
+
+    migration["_compiled_pattern"] = compiled
+    migration["_literal_prefix"] = _extract_literal_prefix(pattern)
+    migration["_effective_date"] = effective_date
+    migration["_needs_substitution"] = substitute
+    migration["_compiled_from"] = source
+
 
 class ConfigManager:
     """Manages configuration loading and validation."""
 
     DEFAULT_CONFIG_PATH = Path("/usr/share/eol-rebaser/migrations.yaml")
     DEFAULT_CONFIG_DIR = Path("/usr/share/eol-rebaser/migrations.yaml.d")
+    MAX_DROP_IN_WORKERS = 8
 
     def __init__(self, config_path: Optional[Path] = None):
         """Initialize configuration manager.
@@ -26,10 +412,14 @@ class ConfigManager:
         """
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
         self.config_dir = self.DEFAULT_CONFIG_DIR
+        self._config: Optional[Dict[str, Any]] = None
 
     def load_config(self) -> Dict[str, Any]:
         """Load and merge configuration from main file and drop-ins.
 
+        The merged configuration is cached, so later calls return it without
+        re-reading any files.
+
         Returns:
             Merged configuration dictionary
 
@@ -37,6 +427,9 @@ class ConfigManager:
             FileNotFoundError: If main config file doesn't exist
             ValueError: If configuration is invalid
         """
+        if self._config is not None:
+            return self._config
+
         # Load main configuration
         if not self.config_path.exists():
             logger.error(f"Configuration file not found: {self.config_path}")
@@ -48,13 +441,10 @@ class ConfigManager:
         # Load drop-in configurations
         if self.config_dir.exists():
             logger.info(f"Loading drop-in configurations from {self.config_dir}")
-            drop_ins = []
-            for conf_file in sorted(self.config_dir.glob("*.yaml")) + sorted(
+            conf_files = sorted(self.config_dir.glob("*.yaml")) + sorted(
                 self.config_dir.glob("*.yml")
-            ):
-                logger.debug(f"Loading drop-in: {conf_file}")
-                drop_in_config = self._load_yaml_file(conf_file)
-                drop_ins.append(drop_in_config)
+            )
+            drop_ins = self._load_drop_ins(conf_files)
 
             # Merge drop-ins into main config
             config = self._merge_configs(config, drop_ins)
@@ -62,8 +452,31 @@ class ConfigManager:
         # Validate configuration
         self._validate_config(config)
 
+        self._config = config
         return config
 
+    def _load_drop_ins(self, conf_files: List[Path]) -> List[Dict[str, Any]]:
+        """Load drop-in configuration files, reading them concurrently.
+
+        Args:
+            conf_files: Drop-in files in merge order
+
+        Returns:
+            Parsed drop-in configurations in the same order as conf_files
+
+        Raises:
+            ValueError: If any drop-in cannot be parsed
+        """
+        for conf_file in conf_files:
+            logger.debug(f"Loading drop-in: {conf_file}")
+
+        if len(conf_files) <= 1:
+            return [self._load_yaml_file(conf_file) for conf_file in conf_files]
+
+        workers = min(self.MAX_DROP_IN_WORKERS, len(conf_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._load_yaml_file, conf_files))
+
     def _load_yaml_file(self, file_path: Path) -> Dict[str, Any]:
         """Load YAML configuration file.
 
@@ -77,8 +490,8 @@ class ConfigManager:
             ValueError: If file cannot be parsed
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = yaml.safe_load(f)
+            with open(file_path, "rb") as f:
+                content = yaml.load(f, Loader=SafeLoader)
                 return content or {}
 
         except yaml.YAMLError as e:
@@ -143,25 +556,37 @@ class ConfigManager:
             if field not in migration:
                 raise ValueError(f"Migration {index}: missing required field '{field}'")
 
-        # Validate regex pattern
+        # Validate regex pattern and effective_date, keeping the compiled
+        # pattern and parsed date for matching
         try:
-            re.compile(migration["from_pattern"])
+            compile_migration(migration)
         except re.error as e:
             raise ValueError(
                 f"Migration {index}: invalid regex pattern '{migration['from_pattern']}': {e}"
             )
-
-        # Validate effective_date if present
-        if "effective_date" in migration:
-            try:
-                datetime.strptime(migration["effective_date"], "%Y-%m-%d")
-            except ValueError as e:
-                raise ValueError(
-                    f"Migration {index}: invalid date format '{migration['effective_date']}': {e}"
-                )
+        except ValueError as e:
+            raise ValueError(
+                f"Migration {index}: invalid date format '{migration['effective_date']}': {e}"
+            )
 
         logger.debug(f"Validated migration: {migration['name']}")
 
+    def iter_migrations_for_image(self, image: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over migrations applicable to the given image, in order.
+
+        Args:
+            image: Container image name to check
+
+        Yields:
+            Applicable migration configurations
+        """
+        for migration in self.load_config()["migrations"]:
+            # Cheap literal prefix check before running the regex
+            if not image.startswith(migration["_literal_prefix"]):
+                continue
+            if migration["_compiled_pattern"].fullmatch(image):
+                yield migration
+
     def get_migrations_for_image(self, image: str) -> List[Dict[str, Any]]:
         """Get all migrations applicable to the given image.
 
@@ -171,12 +596,4 @@ class ConfigManager:
         Returns:
             List of applicable migration configurations
         """
-        config = self.load_config()
-        applicable_migrations = []
-
-        for migration in config["migrations"]:
-            pattern = migration["from_pattern"]
-            if re.match(pattern, image):
-                applicable_migrations.append(migration)
-
-        return applicable_migrations
+        return list(self.iter_migrations_for_image(image))
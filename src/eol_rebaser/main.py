@@ -6,16 +6,13 @@ Automatically rebase bootc systems when images reach end of life.
 """
 
 import argparse
+import functools
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import Optional
 
-from .config import ConfigManager
-from .migrator import ImageMigrator
-from .bootc import BootcManager
-from .notifications import NotificationManager
-
 
 def setup_logging(verbose: bool = False) -> None:
     """Setup logging configuration."""
@@ -27,6 +24,7 @@ def setup_logging(verbose: bool = False) -> None:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def create_parser() -> argparse.ArgumentParser:
     """Create command line argument parser."""
     parser = argparse.ArgumentParser(
@@ -41,11 +39,14 @@ Examples:
         """,
     )
 
-    parser.add_argument(
+    # --dry-run is left out of the group since it qualifies --migrate
+    action = parser.add_mutually_exclusive_group()
+
+    action.add_argument(
         "--check", action="store_true", help="Check if current image needs migration"
     )
 
-    parser.add_argument(
+    action.add_argument(
         "--migrate", action="store_true", help="Perform migration if needed"
     )
 
@@ -88,6 +89,12 @@ def main() -> int:
     setup_logging(args.verbose)
     logger = logging.getLogger(__name__)
 
+    # Imported here so --help and --version don't pay for loading YAML et al.
+    from .config import ConfigManager
+    from .migrator import ImageMigrator
+    from .bootc import BootcManager
+    from .notifications import NotificationManager
+
     try:
         # Load configuration
         config_manager = ConfigManager(args.config)
@@ -98,8 +105,13 @@ def main() -> int:
         notification_manager = NotificationManager()
         migrator = ImageMigrator(bootc_manager, notification_manager, config)
 
-        # Get current image
-        current_image = bootc_manager.get_current_image()
+        # Get current image. Dry runs may supply it through the environment,
+        # which skips running bootc (and sudo) entirely.
+        current_image = None
+        if args.dry_run:
+            current_image = os.environ.get("EOL_REBASER_CURRENT_IMAGE")
+        if not current_image:
+            current_image = bootc_manager.get_current_image()
         if not current_image:
             logger.error("Could not determine current bootc image")
             logger.error("This may be due to insufficient privileges.")
@@ -136,7 +148,9 @@ def main() -> int:
                 return 0
 
             # Perform migration
-            success = migrator.perform_migration(migration, args.force)
+            success = migrator.perform_migration(
+                migration, args.force, current_image=current_image
+            )
             return 0 if success else 1
 
         # If no specific action requested, just check and report
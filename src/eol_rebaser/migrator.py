@@ -2,10 +2,16 @@
 
 import logging
 import re
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, Any, Optional, List
 
 from .bootc import BootcManager
+from .config import (
+    compile_migration,
+    compile_pattern,
+    needs_substitution,
+    parse_effective_date,
+)
 from .notifications import NotificationManager
 
 
@@ -27,16 +33,53 @@ class ImageMigrator:
             bootc_manager: Bootc operations manager
             notification_manager: User notification manager
             config: Migration configuration
+
+        Raises:
+            ValueError: If a migration has no from_pattern or an invalid
+                effective_date
+            re.error: If a migration's from_pattern or to_image is invalid
         """
         self.bootc_manager = bootc_manager
         self.notification_manager = notification_manager
         self.config = config
 
-    def find_migration(self, current_image: str) -> Optional[Dict[str, Any]]:
+        # Compile patterns and parse dates once instead of on every lookup,
+        # and index migrations by the literal prefix of their pattern so
+        # lookups only run the regexes that can possibly match
+        self._prefix_index: Dict[str, List[int]] = {}
+        for index, migration in enumerate(self.config.get("migrations", [])):
+            compile_migration(migration)
+            prefix = migration["_literal_prefix"]
+            self._prefix_index.setdefault(prefix, []).append(index)
+        self._prefix_lengths = sorted(
+            {len(prefix) for prefix in self._prefix_index}, reverse=True
+        )
+
+    def _candidate_migrations(self, current_image: str) -> List[Dict[str, Any]]:
+        """Get migrations whose pattern prefix matches the image.
+
+        Args:
+            current_image: Current container image name
+
+        Returns:
+            Candidate migration configurations, in configuration order
+        """
+        indices: List[int] = []
+        for length in self._prefix_lengths:
+            if length <= len(current_image):
+                indices.extend(self._prefix_index.get(current_image[:length], ()))
+
+        migrations = self.config["migrations"]
+        return [migrations[index] for index in sorted(indices)]
+
+    def find_migration(
+        self, current_image: str, today: Optional[date] = None
+    ) -> Optional[Dict[str, Any]]:
         """Find applicable migration for the current image.
 
         Args:
             current_image: Current container image name
+            today: Date to check effective dates against (default: today)
 
         Returns:
             Migration configuration if found, None otherwise
@@ -45,13 +88,16 @@ class ImageMigrator:
             logger.warning("No migrations configured")
             return None
 
-        migrations = self.config["migrations"]
+        migrations = self._candidate_migrations(current_image)
         logger.debug(
             f"Checking {len(migrations)} migrations for image: {current_image}"
         )
 
+        if today is None:
+            today = date.today()
+
         for migration in migrations:
-            if self._is_migration_applicable(migration, current_image):
+            if self._is_migration_applicable(migration, current_image, today):
                 logger.info(f"Found applicable migration: {migration['name']}")
                 return migration
 
@@ -59,35 +105,32 @@ class ImageMigrator:
         return None
 
     def _is_migration_applicable(
-        self, migration: Dict[str, Any], current_image: str
+        self, migration: Dict[str, Any], current_image: str, today: date
     ) -> bool:
         """Check if a migration applies to the current image.
 
         Args:
             migration: Migration configuration
             current_image: Current container image name
+            today: Date to check the effective date against
 
         Returns:
             True if migration applies, False otherwise
         """
         # Check if image matches the pattern
-        pattern = migration.get("from_pattern", "")
-        if not re.match(pattern, current_image):
-            logger.debug(f"Image {current_image} does not match pattern {pattern}")
+        if not migration["_compiled_pattern"].fullmatch(current_image):
+            logger.debug(
+                f"Image {current_image} does not match pattern {migration['from_pattern']}"
+            )
             return False
 
         # Check if migration is effective yet
-        effective_date = migration.get("effective_date")
-        if effective_date:
-            try:
-                effective_dt = datetime.strptime(effective_date, "%Y-%m-%d")
-                if datetime.now() < effective_dt:
-                    logger.debug(
-                        f"Migration not yet effective (effective: {effective_date})"
-                    )
-                    return False
-            except ValueError as e:
-                logger.warning(f"Invalid effective_date format: {effective_date}: {e}")
+        effective_date = migration["_effective_date"]
+        if effective_date and today < effective_date:
+            logger.debug(
+                f"Migration not yet effective (effective: {migration['effective_date']})"
+            )
+            return False
 
         logger.debug(f"Migration {migration['name']} is applicable")
         return True
@@ -104,31 +147,41 @@ class ImageMigrator:
         Returns:
             Resolved target image name
         """
-        target_template = migration.get("to_image", "")
-        from_pattern = migration.get("from_pattern", "")
+        target_template: str = migration.get("to_image", "")
 
-        # Check if target template contains regex substitution patterns
-        if "\\" in target_template and from_pattern:
-            try:
-                # Use regex substitution to transform the image name
-                target_image = re.sub(from_pattern, target_template, current_image)
-                logger.debug(
-                    f"Resolved target image: {current_image} -> {target_image}"
-                )
-                return target_image
-            except re.error as e:
-                logger.error(f"Failed to resolve target image pattern: {e}")
-                return target_template
-        else:
+        if not migration["_needs_substitution"]:
             # Use target template as-is (legacy behavior)
             return target_template
 
-    def perform_migration(self, migration: Dict[str, Any], force: bool = False) -> bool:
+        match = migration["_compiled_pattern"].fullmatch(current_image)
+        if not match:
+            logger.error(
+                f"Cannot resolve target image: {current_image} does not match "
+                f"pattern {migration['from_pattern']}"
+            )
+            return target_template
+
+        try:
+            # Substitute the captured groups into the target template
+            target_image: str = match.expand(target_template)
+            logger.debug(f"Resolved target image: {current_image} -> {target_image}")
+            return target_image
+        except (re.error, IndexError) as e:
+            logger.error(f"Failed to resolve target image pattern: {e}")
+            return target_template
+
+    def perform_migration(
+        self,
+        migration: Dict[str, Any],
+        force: bool = False,
+        current_image: Optional[str] = None,
+    ) -> bool:
         """Perform the specified migration.
 
         Args:
             migration: Migration configuration to execute
             force: Force migration even if not normally applicable
+            current_image: Current container image, if already known
 
         Returns:
             True if migration was successful, False otherwise
@@ -137,7 +190,8 @@ class ImageMigrator:
         reason = migration.get("reason", "Image migration")
 
         # Get current image for target resolution
-        current_image = self.bootc_manager.get_current_image()
+        if current_image is None:
+            current_image = self.bootc_manager.get_current_image()
         if not current_image:
             logger.error("Could not determine current image")
             return False
@@ -217,13 +271,17 @@ class ImageMigrator:
         # For now, just log to the main log
 
     def get_pending_migrations(
-        self, current_image: str, include_future: bool = False
+        self,
+        current_image: str,
+        include_future: bool = False,
+        today: Optional[date] = None,
     ) -> List[Dict[str, Any]]:
         """Get list of pending migrations for the current image.
 
         Args:
             current_image: Current container image name
             include_future: Include migrations not yet effective
+            today: Date to check effective dates against (default: today)
 
         Returns:
             List of pending migration configurations
@@ -233,23 +291,19 @@ class ImageMigrator:
         if "migrations" not in self.config:
             return pending
 
-        for migration in self.config["migrations"]:
+        if today is None:
+            today = date.today()
+
+        for migration in self._candidate_migrations(current_image):
             # Check pattern match
-            pattern = migration.get("from_pattern", "")
-            if not re.match(pattern, current_image):
+            if not migration["_compiled_pattern"].fullmatch(current_image):
                 continue
 
             # Check effective date if not including future migrations
             if not include_future:
-                effective_date = migration.get("effective_date")
-                if effective_date:
-                    try:
-                        effective_dt = datetime.strptime(effective_date, "%Y-%m-%d")
-                        if datetime.now() < effective_dt:
-                            continue
-                    except ValueError:
-                        # Skip migrations with invalid dates
-                        continue
+                effective_date = migration["_effective_date"]
+                if effective_date and today < effective_date:
+                    continue
 
             pending.append(migration)
 
@@ -276,7 +330,7 @@ class ImageMigrator:
         pattern = migration.get("from_pattern", "")
         if pattern:
             try:
-                re.compile(pattern)
+                compile_pattern(pattern)
             except re.error as e:
                 errors.append(f"Invalid regex pattern '{pattern}': {e}")
 
@@ -284,7 +338,7 @@ class ImageMigrator:
         target_image = migration.get("to_image", "")
         if target_image:
             # If target contains regex substitution patterns, validate differently
-            if "\\" in target_image:
+            if needs_substitution(target_image):
                 # For regex substitution patterns, just check basic format
                 if not target_image.strip():
                     errors.append("Target image template cannot be empty")
@@ -297,7 +351,7 @@ class ImageMigrator:
         effective_date = migration.get("effective_date")
         if effective_date:
             try:
-                datetime.strptime(effective_date, "%Y-%m-%d")
+                parse_effective_date(effective_date)
             except ValueError as e:
                 errors.append(f"Invalid effective_date format '{effective_date}': {e}")
 
@@ -1,10 +1,13 @@
 """User notification system for EOL Rebaser."""
 
+import contextlib
 import json
 import logging
 import os
+import shutil
 import subprocess
-from typing import Optional, Tuple
+import threading
+from typing import Dict, List, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
@@ -18,6 +21,7 @@ class NotificationManager:
         self.user_session = (
             self._get_active_user_session() if os.getuid() == 0 else None
         )
+        self._notify_send_path = shutil.which("notify-send")
         self.desktop_available = self._check_desktop_environment()
 
     def _get_active_user_session(self) -> Optional[Tuple[str, str]]:
@@ -30,7 +34,6 @@ class NotificationManager:
             result = subprocess.run(
                 ["loginctl", "list-users", "-j"],
                 capture_output=True,
-                text=True,
                 check=True,
                 timeout=10,
             )
@@ -67,40 +70,23 @@ class NotificationManager:
         Returns:
             True if desktop notifications are available, False otherwise
         """
+        if not self._notify_send_path:
+            logger.debug("notify-send not available, desktop notifications disabled")
+            return False
+
         if os.getuid() == 0:
-            try:
-                # Check if loginctl is available for user session management
-                subprocess.run(
-                    ["which", "loginctl"], capture_output=True, check=True, timeout=5
-                )
+            # Check if loginctl is available for user session management
+            if shutil.which("loginctl"):
                 logger.debug(
                     "Running as root, will use loginctl for user notifications"
                 )
                 return True
-            except (
-                subprocess.CalledProcessError,
-                subprocess.TimeoutExpired,
-                FileNotFoundError,
-            ):
-                logger.debug("loginctl not available, desktop notifications disabled")
-                return False
-
-        try:
-            subprocess.run(
-                ["which", "notify-send"], capture_output=True, check=True, timeout=5
-            )
-            logger.debug("Desktop notifications available")
-            return True
 
-        except (
-            subprocess.CalledProcessError,
-            subprocess.TimeoutExpired,
-            FileNotFoundError,
-        ):
-            pass
+            logger.debug("loginctl not available, desktop notifications disabled")
+            return False
 
-        logger.debug("Desktop notifications not available")
-        return False
+        logger.debug("Desktop notifications available")
+        return True
 
     def notify_migration_start(
         self, migration_name: str, from_image: str, to_image: str, reason: str
@@ -123,15 +109,7 @@ class NotificationManager:
 
         logger.info(f"Migration starting: {migration_name}")
 
-        # Send desktop notification if available
-        if self.desktop_available:
-            self._send_desktop_notification(title, message, "system-software-update")
-
-        # Always log to journal/console
-        self._log_notification(title, message)
-
-        # Send wall message to all users if we can
-        self._send_wall_message(f"{title}: {message}")
+        self._dispatch_notifications(title, message, "system-software-update")
 
     def notify_migration_success(self, migration_name: str, target_image: str) -> None:
         """Notify user that migration completed successfully.
@@ -149,11 +127,7 @@ class NotificationManager:
 
         logger.info(f"Migration completed successfully: {migration_name}")
 
-        if self.desktop_available:
-            self._send_desktop_notification(title, message, "system-software-update")
-
-        self._log_notification(title, message)
-        self._send_wall_message(f"{title}: {message}")
+        self._dispatch_notifications(title, message, "system-software-update")
 
     def notify_migration_failure(self, migration_name: str, error: str) -> None:
         """Notify user that migration failed.
@@ -172,11 +146,7 @@ class NotificationManager:
 
         logger.error(f"Migration failed: {migration_name} - {error}")
 
-        if self.desktop_available:
-            self._send_desktop_notification(title, message, "dialog-error", urgent=True)
-
-        self._log_notification(title, message)
-        self._send_wall_message(f"{title}: {message}")
+        self._dispatch_notifications(title, message, "dialog-error", urgent=True)
 
     def notify_reboot_required(self, migration_name: str) -> None:
         """Notify user that a reboot is required to complete migration.
@@ -197,6 +167,82 @@ class NotificationManager:
 
         self._log_notification(title, message)
 
+    def _dispatch_notifications(
+        self, title: str, message: str, icon: str, urgent: bool = False
+    ) -> None:
+        """Send a notification through every available channel at once.
+
+        The notification commands are started without waiting for each other,
+        so a slow desktop notifier doesn't hold up the migration.
+
+        Args:
+            title: Notification title
+            message: Notification message body
+            icon: Icon name to display
+            urgent: Whether notification should be marked urgent
+        """
+        # Send desktop notification if available
+        if self.desktop_available:
+            self._send_desktop_notification(title, message, icon, urgent=urgent)
+
+        # Always log to journal/console
+        self._log_notification(title, message)
+
+        # Send wall message to all users if we can
+        self._send_wall_message(f"{title}: {message}")
+
+    def _spawn(
+        self,
+        cmd: List[str],
+        timeout: float,
+        input: Optional[bytes] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Start a notification command without waiting for it to finish.
+
+        A reaper thread waits for the command in the background and kills it
+        after the timeout. The thread is not a daemon, so the interpreter
+        still lets commands finish before it exits.
+
+        Args:
+            cmd: Command to run
+            timeout: Seconds to allow the command to run
+            input: Data to write to the command's stdin
+            env: Environment for the command
+        """
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+        try:
+            if input is not None and proc.stdin is not None:
+                # The command may exit without reading its input
+                try:
+                    with contextlib.suppress(BrokenPipeError):
+                        proc.stdin.write(input)
+                finally:
+                    with contextlib.suppress(BrokenPipeError):
+                        proc.stdin.close()
+        finally:
+            threading.Thread(target=self._reap, args=(proc, timeout)).start()
+
+    @staticmethod
+    def _reap(proc: "subprocess.Popen[bytes]", timeout: float) -> None:
+        """Wait for a spawned command, killing it if it runs too long.
+
+        Args:
+            proc: Spawned command
+            timeout: Seconds to wait before killing the command
+        """
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
     def _send_desktop_notification(
         self,
         title: str,
@@ -214,9 +260,10 @@ class NotificationManager:
         """
         try:
             cmd = [
-                "notify-send",
+                self._notify_send_path or "notify-send",
                 "--app-name=EOL Rebaser",
-                "--icon=" + icon,
+                "--icon",
+                icon,
                 title,
                 message,
             ]
@@ -234,11 +281,11 @@ class NotificationManager:
                 env["DBUS_SESSION_BUS_ADDRESS"] = f"unix:path={xdg_runtime_path}/bus"
 
                 sudo_cmd = ["sudo", "-u", username] + cmd
-                subprocess.run(sudo_cmd, capture_output=True, timeout=10, env=env)
+                self._spawn(sudo_cmd, timeout=10, env=env)
                 logger.debug(f"Desktop notification sent to user {username}: {title}")
             else:
                 # Standard notification for non-root users
-                subprocess.run(cmd, capture_output=True, timeout=10)
+                self._spawn(cmd, timeout=10)
                 logger.debug(f"Desktop notification sent: {title}")
 
         except Exception as e:
@@ -256,11 +303,10 @@ class NotificationManager:
 
         # Also try to log to systemd journal if available
         try:
-            subprocess.run(
+            self._spawn(
                 ["systemd-cat", "--identifier=eol-rebaser", "--priority=info"],
-                input=full_message,
-                text=True,
                 timeout=5,
+                input=full_message.encode(),
             )
         except Exception:
             # Journal logging is optional
@@ -273,9 +319,7 @@ class NotificationManager:
             message: Message to broadcast
         """
         try:
-            subprocess.run(
-                ["wall"], input=f"[EOL Rebaser] {message}", text=True, timeout=10
-            )
+            self._spawn(["wall"], timeout=10, input=f"[EOL Rebaser] {message}".encode())
             logger.debug("Wall message sent")
         except Exception as e:
             logger.debug(f"Could not send wall message: {e}")
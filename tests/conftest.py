@@ -0,0 +1,23 @@
+"""Shared pytest fixtures for EOL Rebaser tests."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from eol_rebaser.config import ConfigManager
+from eol_rebaser.migrator import ImageMigrator
+
+AURORA_CONFIG_PATH = Path(__file__).parent / "fixtures" / "aurora_hwe_eol.yaml"
+
+
+@pytest.fixture(scope="session")
+def aurora_config():
+    """Load the Aurora migration config once per test session."""
+    return ConfigManager(AURORA_CONFIG_PATH).load_config()
+
+
+@pytest.fixture(scope="session")
+def aurora_migrator(aurora_config):
+    """Build one ImageMigrator shared by the read-only Aurora pattern tests."""
+    return ImageMigrator(Mock(), Mock(), aurora_config)
@@ -1,36 +1,58 @@
 """Tests for EOL Rebaser."""
 
+import copy
+import re
+from collections import namedtuple
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from datetime import date
+from unittest.mock import Mock
 from pathlib import Path
-import tempfile
-import os
 import subprocess
 
+import pytest
+import yaml
+
 # Import modules to test
-from eol_rebaser.config import ConfigManager
+from eol_rebaser import config as config_module
+from eol_rebaser.config import (
+    ConfigManager,
+    _extract_literal_prefix,
+    compile_migration,
+    compile_pattern,
+)
 from eol_rebaser.bootc import BootcManager
+from eol_rebaser.main import main
 from eol_rebaser.migrator import ImageMigrator
 from eol_rebaser.notifications import NotificationManager
 
 
-class TestConfigManager(unittest.TestCase):
-    """Test configuration management."""
+# Stand-in for the subprocess.CompletedProcess returned by subprocess.run
+_RunResult = namedtuple(
+    "_RunResult", "returncode stdout stderr", defaults=(0, b"", b"")
+)
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_path = Path(self.temp_dir) / "test_config.yaml"
+_BOOTC_STATUS = b'{"spec": {"image": {"image": "test/image:latest"}}}'
 
-    def tearDown(self):
-        """Clean up test fixtures."""
-        import shutil
 
-        shutil.rmtree(self.temp_dir)
+class _StubBootc:
+    """Minimal stand-in for BootcManager with the methods the migrator calls."""
 
-    def test_load_valid_config(self):
-        """Test loading a valid configuration file."""
-        config_content = """
+    def __init__(self):
+        self.validate_image_reference = Mock(return_value=True)
+        self.get_current_image = Mock()
+        self.rebase_to_image = Mock()
+
+
+class _StubNotifications:
+    """Minimal stand-in for NotificationManager."""
+
+    def __init__(self):
+        self.notify_migration_start = Mock()
+        self.notify_migration_success = Mock()
+        self.notify_migration_failure = Mock()
+
+
+_VALID_CONFIG = b"""
 migrations:
   - name: "Test Migration"
     from_pattern: "test/image:.*"
@@ -38,7 +60,20 @@ migrations:
     reason: "Test migration"
     effective_date: "2024-01-01"
 """
-        self.config_path.write_text(config_content)
+
+
+class TestConfigManager(unittest.TestCase):
+    """Test configuration management."""
+
+    @pytest.fixture(autouse=True)
+    def _tmp(self, tmp_path):
+        """Set up test fixtures."""
+        self.tmp_path = tmp_path
+        self.config_path = tmp_path / "test_config.yaml"
+
+    def test_load_valid_config(self):
+        """Test loading a valid configuration file."""
+        self.config_path.write_bytes(_VALID_CONFIG)
 
         config_manager = ConfigManager(self.config_path)
         config = config_manager.load_config()
@@ -50,6 +85,48 @@ migrations:
         self.assertEqual(config["migrations"][0]["to_image"], "test/new-image:latest")
         self.assertEqual(config["migrations"][0]["reason"], "Test migration")
         self.assertEqual(config["migrations"][0]["effective_date"], "2024-01-01")
+        self.assertEqual(config["migrations"][0]["_effective_date"], date(2024, 1, 1))
+
+    def test_yaml_uses_libyaml_loader(self):
+        """Test that configuration parsing uses the libyaml C loader."""
+        # Guards against silently falling back to the pure-Python loader
+        self.assertTrue(yaml.__with_libyaml__, "PyYAML was built without libyaml")
+        self.assertIs(config_module.SafeLoader, yaml.CSafeLoader)
+
+    def test_load_config_is_cached(self):
+        """Test that configuration files are only read once per manager."""
+        self.config_path.write_bytes(_VALID_CONFIG)
+
+        config_manager = ConfigManager(self.config_path)
+        config = config_manager.load_config()
+        self.config_path.write_text("migrations: []\n")
+
+        self.assertIs(config_manager.load_config(), config)
+
+    def test_load_drop_in_configs(self):
+        """Test that drop-in migrations are merged in file name order."""
+        self.config_path.write_text("migrations: []\n")
+        drop_in_dir = self.tmp_path / "migrations.yaml.d"
+        drop_in_dir.mkdir()
+        for name in ("20-second.yaml", "10-first.yaml", "30-third.yml"):
+            (drop_in_dir / name).write_text(
+                f"""
+migrations:
+  - name: "{name}"
+    from_pattern: "test/image:.*"
+    to_image: "test/new-image:latest"
+    reason: "Test migration"
+"""
+            )
+
+        config_manager = ConfigManager(self.config_path)
+        config_manager.config_dir = drop_in_dir
+        config = config_manager.load_config()
+
+        self.assertEqual(
+            [migration["name"] for migration in config["migrations"]],
+            ["10-first.yaml", "20-second.yaml", "30-third.yml"],
+        )
 
     def test_invalid_config_raises_error(self):
         """Test that invalid configuration raises appropriate error."""
@@ -80,69 +157,214 @@ migrations:
         with self.assertRaises(ValueError):
             config_manager._validate_migration(invalid_migration, 0)
 
+    def test_get_migrations_for_image(self):
+        """Test matching images against the configured migrations."""
+        self.config_path.write_bytes(_VALID_CONFIG)
+
+        config_manager = ConfigManager(self.config_path)
+        migrations = config_manager.get_migrations_for_image("test/image:v1")
+
+        self.assertEqual(len(migrations), 1)
+        self.assertEqual(migrations[0]["name"], "Test Migration")
+        self.assertEqual(config_manager.get_migrations_for_image("other/image:v1"), [])
 
-class TestBootcManager(unittest.TestCase):
+        first = next(config_manager.iter_migrations_for_image("test/image:v1"), None)
+        self.assertIs(first, migrations[0])
+
+    def test_extract_literal_prefix(self):
+        """Test extraction of the literal prefix of migration patterns."""
+        self.assertEqual(
+            _extract_literal_prefix(r"ghcr\.io/ublue-os/(aurora(?:-dx)?)-asus:(.+)"),
+            "ghcr.io/ublue-os/",
+        )
+        self.assertEqual(_extract_literal_prefix("test/image:.*"), "test/image:")
+        self.assertEqual(_extract_literal_prefix("^test:.*"), "test:")
+        self.assertEqual(_extract_literal_prefix("test/images?:.*"), "test/image")
+        self.assertEqual(_extract_literal_prefix(r"\w+/image"), "")
+        self.assertEqual(_extract_literal_prefix("old/image|new/image"), "")
+
+    def test_compile_pattern_rejects_nested_quantifiers(self):
+        """Test that patterns prone to catastrophic backtracking are rejected."""
+        for pattern in (
+            "(.+)+",
+            "(.*)*",
+            "old/(a+)*b",
+            "((?:\\w+))+",
+            "(\\w+-?)+",
+            "(?:[a-z]+-?)+",
+            "(a|a)*b",
+            "(a|ab|b)*c",
+        ):
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(re.error):
+                    compile_pattern(pattern)
+
+        for pattern in (
+            "ghcr\\.io/ublue-os/(aurora(?:-dx)?)-asus(-nvidia(?:-open)?)?:(.+)",
+            "old/image(-[a-z]+)*:.*",
+            "old/image:(.+)?",
+            "(a{2})+",
+            "(foo|bar)+",
+            "(?:ab+)+",
+            "ghcr\\.io/(?:[^/]+/)*aurora-asus:(.+)",
+            "registry\\.example\\.com/([\\w-]+/)+old:.*",
+        ):
+            with self.subTest(pattern=pattern):
+                compile_pattern(pattern)
+
+    def test_invalid_migration_pattern_raises_error(self):
+        """Test that nested quantifiers fail configuration validation."""
+        config_manager = ConfigManager()
+        migration = {
+            "name": "Test",
+            "from_pattern": "test:(.*)*",
+            "to_image": "test:new",
+            "reason": "Testing",
+        }
+        with self.assertRaises(ValueError):
+            config_manager._validate_migration(migration, 0)
+
+    def test_invalid_group_reference_raises_error(self):
+        """Test that to_image may only reference groups of from_pattern."""
+        config_manager = ConfigManager()
+        migration = {
+            "name": "Test",
+            "from_pattern": "test/(image):(.*)",
+            "to_image": "test/\\1-new:\\3",
+            "reason": "Testing",
+        }
+        with self.assertRaises(ValueError):
+            config_manager._validate_migration(migration, 0)
+
+        migration["to_image"] = "test/\\1-new:\\2"
+        config_manager._validate_migration(migration, 0)  # Should not raise
+        self.assertTrue(migration["_needs_substitution"])
+
+    def test_effective_date_format(self):
+        """Test that effective dates use YYYY-MM-DD, with or without padding."""
+        config_manager = ConfigManager()
+        migration = {
+            "name": "Test",
+            "from_pattern": "test:.*",
+            "to_image": "test:new",
+            "reason": "Testing",
+            "effective_date": "2025-1-5",
+        }
+        config_manager._validate_migration(migration, 0)  # Should not raise
+        self.assertEqual(migration["_effective_date"], date(2025, 1, 5))
+
+        for value in ("20251015", "2025-W42-3", "2025-13-01"):
+            with self.subTest(effective_date=value):
+                migration["effective_date"] = value
+                with self.assertRaises(ValueError):
+                    config_manager._validate_migration(migration, 0)
+
+    def test_compile_migration_tracks_changes(self):
+        """Test that recompiling a changed migration refreshes derived data."""
+        migration = {
+            "name": "Test",
+            "from_pattern": "test/(image):(.*)",
+            "to_image": "test/new:latest",
+            "reason": "Testing",
+        }
+        compile_migration(migration)
+        compiled = migration["_compiled_pattern"]
+        self.assertFalse(migration["_needs_substitution"])
+        self.assertIsNone(migration["_effective_date"])
+
+        compile_migration(migration)
+        self.assertIs(migration["_compiled_pattern"], compiled)
+
+        migration["to_image"] = "test/\\1-new:\\2"
+        migration["effective_date"] = "2024-01-01"
+        compile_migration(migration)
+        self.assertTrue(migration["_needs_substitution"])
+        self.assertEqual(migration["_effective_date"], date(2024, 1, 1))
+
+
+class TestBootcManager:
     """Test bootc operations."""
 
-    def setUp(self):
+    @pytest.fixture(autouse=True)
+    def _setup(self, monkeypatch):
         """Set up test fixtures."""
         self.bootc_manager = BootcManager()
+        self.mock_run = Mock()
+        self.mock_which = Mock(return_value="/usr/bin/bootc")
+        monkeypatch.setattr("subprocess.run", self.mock_run)
+        monkeypatch.setattr("shutil.which", self.mock_which)
 
-    @patch("subprocess.run")
-    def test_get_current_image_success(self, mock_run):
+    def test_get_current_image_success(self):
         """Test successful retrieval of current image."""
         # Mock successful bootc status output
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = '{"spec": {"image": {"image": "test/image:latest"}}}'
-        mock_run.return_value = mock_result
+        self.mock_run.return_value = _RunResult(stdout=_BOOTC_STATUS)
 
-        current_image = self.bootc_manager.get_current_image()
-        self.assertEqual(current_image, "test/image:latest")
+        assert self.bootc_manager.get_current_image() == "test/image:latest"
 
-    @patch("subprocess.run")
-    def test_get_current_image_failure(self, mock_run):
+    def test_get_current_image_failure(self):
         """Test handling of bootc command failure."""
         # Mock failed bootc status
-        mock_run.side_effect = subprocess.CalledProcessError(1, "bootc")
-
-        current_image = self.bootc_manager.get_current_image()
-        self.assertIsNone(current_image)
-
-    def test_validate_image_reference(self):
-        """Test image reference validation."""
-        # Valid references
-        self.assertTrue(
-            self.bootc_manager.validate_image_reference("registry.io/image:tag")
-        )
-        self.assertTrue(self.bootc_manager.validate_image_reference("image:tag"))
-        self.assertTrue(self.bootc_manager.validate_image_reference("registry/image"))
-
-        # Invalid references
-        self.assertFalse(self.bootc_manager.validate_image_reference(""))
-        self.assertFalse(self.bootc_manager.validate_image_reference(None))
-
-    @patch("subprocess.run")
-    def test_rebase_to_image_success(self, mock_run):
+        self.mock_run.side_effect = subprocess.CalledProcessError(1, "bootc")
+
+        assert self.bootc_manager.get_current_image() is None
+
+    def test_get_current_image_without_bootc(self):
+        """Test that bootc status is not run when bootc is not installed."""
+        self.mock_which.return_value = None
+
+        assert self.bootc_manager.get_current_image() is None
+        self.mock_run.assert_not_called()
+
+    def test_get_current_image_uses_cached_status(self):
+        """Test that bootc status is only queried once per manager."""
+        self.mock_run.return_value = _RunResult(stdout=_BOOTC_STATUS)
+
+        assert self.bootc_manager.get_current_image() == "test/image:latest"
+        assert self.bootc_manager.get_current_image() == "test/image:latest"
+        self.mock_run.assert_called_once()
+
+    def test_rebase_invalidates_cached_status(self):
+        """Test that a successful rebase forces bootc status to be queried again."""
+        self.mock_run.return_value = _RunResult(stdout=_BOOTC_STATUS)
+
+        self.bootc_manager.get_current_image()
+        assert self.bootc_manager.rebase_to_image("test/image:new")
+        self.bootc_manager.get_current_image()
+        assert self.mock_run.call_count == 3
+
+    @pytest.mark.parametrize(
+        "image",
+        [
+            "registry.io/image:tag",
+            "image:tag",
+            "registry/image",
+            "localhost:5000/image:tag",
+            "registry.io/image@sha256:" + "a" * 64,
+        ],
+    )
+    def test_validate_valid_image_reference(self, image):
+        """Test that well-formed image references are accepted."""
+        assert self.bootc_manager.validate_image_reference(image)
+
+    @pytest.mark.parametrize(
+        "image",
+        ["", None, "image:tag:tag", "bad image", "registry.io/image@sha256:abc"],
+    )
+    def test_validate_invalid_image_reference(self, image):
+        """Test that malformed image references are rejected."""
+        assert not self.bootc_manager.validate_image_reference(image)
+
+    def test_rebase_to_image_success(self):
         """Test successful image rebase."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Rebase completed"
-        mock_run.return_value = mock_result
+        self.mock_run.return_value = _RunResult(stdout=b"Rebase completed")
 
-        success = self.bootc_manager.rebase_to_image("test/image:new")
-        self.assertTrue(success)
+        assert self.bootc_manager.rebase_to_image("test/image:new")
 
-    @patch("subprocess.run")
-    def test_rebase_to_image_failure(self, mock_run):
+    def test_rebase_to_image_failure(self):
         """Test handling of rebase failure."""
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stderr = "Rebase failed"
-        mock_run.return_value = mock_result
+        self.mock_run.return_value = _RunResult(returncode=1, stderr=b"Rebase failed")
 
-        success = self.bootc_manager.rebase_to_image("test/image:new")
-        self.assertFalse(success)
+        assert not self.bootc_manager.rebase_to_image("test/image:new")
 
 
 class TestImageMigrator(unittest.TestCase):
@@ -150,8 +372,8 @@ class TestImageMigrator(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.mock_bootc = Mock(spec=BootcManager)
-        self.mock_notifications = Mock(spec=NotificationManager)
+        self.mock_bootc = _StubBootc()
+        self.mock_notifications = _StubNotifications()
 
         self.test_config = {
             "migrations": [
@@ -180,6 +402,100 @@ class TestImageMigrator(unittest.TestCase):
         migration = self.migrator.find_migration("different/image:v1.0")
         self.assertIsNone(migration)
 
+    def test_find_migration_uses_configuration_order(self):
+        """Test that the first configured match wins across pattern prefixes."""
+        config = {
+            "migrations": [
+                {
+                    "name": "Generic Migration",
+                    "from_pattern": ".*/image:v1",
+                    "to_image": "new/image:latest",
+                    "reason": "Test migration",
+                },
+                {
+                    "name": "Specific Migration",
+                    "from_pattern": "old/image:v1",
+                    "to_image": "new/image:latest",
+                    "reason": "Test migration",
+                },
+            ]
+        }
+        migrator = ImageMigrator(self.mock_bootc, self.mock_notifications, config)
+
+        migration = migrator.find_migration("old/image:v1")
+        self.assertEqual(migration["name"], "Generic Migration")
+        self.assertEqual(
+            [m["name"] for m in migrator.get_pending_migrations("old/image:v1")],
+            ["Generic Migration", "Specific Migration"],
+        )
+        self.assertIsNone(migrator.find_migration("old"))
+
+    def test_find_migration_requires_full_match(self):
+        """Test that from_pattern has to match the whole image reference."""
+        config = {
+            "migrations": [
+                {
+                    "name": "Tag Migration",
+                    "from_pattern": "old/image:v1",
+                    "to_image": "new/image:latest",
+                    "reason": "Test migration",
+                }
+            ]
+        }
+        migrator = ImageMigrator(self.mock_bootc, self.mock_notifications, config)
+
+        self.assertIsNotNone(migrator.find_migration("old/image:v1"))
+        self.assertIsNone(migrator.find_migration("old/image:v10"))
+
+    def test_find_migration_not_yet_effective(self):
+        """Test that migrations with a future effective date are skipped."""
+        config = {
+            "migrations": [
+                {
+                    "name": "Future Migration",
+                    "from_pattern": "old/image:.*",
+                    "to_image": "new/image:latest",
+                    "reason": "Test migration",
+                    "effective_date": "2999-01-01",
+                }
+            ]
+        }
+        migrator = ImageMigrator(self.mock_bootc, self.mock_notifications, config)
+
+        self.assertIsNone(migrator.find_migration("old/image:v1.0"))
+        self.assertEqual(
+            migrator.get_pending_migrations("old/image:v1.0", include_future=True),
+            config["migrations"],
+        )
+
+        # Once the effective date is reached the migration applies
+        self.assertIsNotNone(
+            migrator.find_migration("old/image:v1.0", today=date(2999, 1, 1))
+        )
+        self.assertEqual(
+            migrator.get_pending_migrations("old/image:v1.0", today=date(2999, 1, 1)),
+            config["migrations"],
+        )
+
+    def test_invalid_pattern_rejected_on_init(self):
+        """Test that invalid patterns are reported when the migrator is created."""
+        config = {
+            "migrations": [
+                {
+                    "name": "Broken Migration",
+                    "from_pattern": "old/image:(",
+                    "to_image": "new/image:latest",
+                    "reason": "Test migration",
+                }
+            ]
+        }
+        with self.assertRaises(re.error):
+            ImageMigrator(self.mock_bootc, self.mock_notifications, config)
+
+        del config["migrations"][0]["from_pattern"]
+        with self.assertRaises(ValueError):
+            ImageMigrator(self.mock_bootc, self.mock_notifications, config)
+
     def test_perform_migration_success(self):
         """Test successful migration execution."""
         self.mock_bootc.validate_image_reference.return_value = True
@@ -193,6 +509,20 @@ class TestImageMigrator(unittest.TestCase):
         self.mock_bootc.rebase_to_image.assert_called_once_with("new/image:latest")
         self.mock_notifications.notify_migration_success.assert_called_once()
 
+    def test_perform_migration_with_known_image(self):
+        """Test that a known current image is not queried from bootc again."""
+        self.mock_bootc.validate_image_reference.return_value = True
+        self.mock_bootc.rebase_to_image.return_value = True
+
+        migration = self.test_config["migrations"][0]
+        success = self.migrator.perform_migration(
+            migration, current_image="old/image:v1.0"
+        )
+
+        self.assertTrue(success)
+        self.mock_bootc.get_current_image.assert_not_called()
+        self.mock_bootc.rebase_to_image.assert_called_once_with("new/image:latest")
+
     def test_perform_migration_failure(self):
         """Test migration failure handling."""
         self.mock_bootc.validate_image_reference.return_value = True
@@ -209,217 +539,18 @@ class TestImageMigrator(unittest.TestCase):
 class TestAuroraHWEMigrations(unittest.TestCase):
     """Test Aurora ASUS, Surface, and HWE to base image migration patterns."""
 
-    def setUp(self):
-        """Set up test fixtures with Aurora migration config."""
-        self.mock_bootc = Mock(spec=BootcManager)
-        self.mock_notifications = Mock(spec=NotificationManager)
+    @pytest.fixture(autouse=True)
+    def _setup(self, aurora_config):
+        """Set up fresh mocks around the shared Aurora migration config."""
+        self.mock_bootc = _StubBootc()
+        self.mock_notifications = _StubNotifications()
 
-        config_path = Path(__file__).parent / "fixtures" / "aurora_hwe_eol.yaml"
-        config_manager = ConfigManager(config_path)
-        self.aurora_config = config_manager.load_config()
+        self.aurora_config = copy.deepcopy(aurora_config)
 
         self.migrator = ImageMigrator(
             self.mock_bootc, self.mock_notifications, self.aurora_config
         )
 
-    def test_asus_migration_patterns(self):
-        """Test ASUS to base Aurora migration patterns."""
-        # Test cases: (source_image, expected_target)
-        asus_test_cases = [
-            (
-                "ghcr.io/ublue-os/aurora-asus:stable",
-                "ghcr.io/ublue-os/aurora:stable",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-asus-nvidia:latest",
-                "ghcr.io/ublue-os/aurora-nvidia:latest",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-asus-nvidia-open:stable-daily",
-                "ghcr.io/ublue-os/aurora-nvidia-open:stable-daily",
-            ),
-            ("ghcr.io/ublue-os/aurora-dx-asus:42", "ghcr.io/ublue-os/aurora-dx:42"),
-            (
-                "ghcr.io/ublue-os/aurora-dx-asus-nvidia:stable",
-                "ghcr.io/ublue-os/aurora-dx-nvidia:stable",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-dx-asus-nvidia-open:latest",
-                "ghcr.io/ublue-os/aurora-dx-nvidia-open:latest",
-            ),
-        ]
-
-        for source_image, expected_target in asus_test_cases:
-            with self.subTest(source=source_image, target=expected_target):
-                migration = self.migrator.find_migration(source_image)
-                self.assertIsNotNone(
-                    migration, f"No migration found for {source_image}"
-                )
-                self.assertEqual(migration["name"], "ASUS end-of-life")
-
-                # Test target image resolution
-                resolved_target = self.migrator._resolve_target_image(
-                    migration, source_image
-                )
-                self.assertEqual(
-                    resolved_target,
-                    expected_target,
-                    f"Expected {source_image} -> {expected_target}, got {resolved_target}",
-                )
-
-    def test_surface_migration_patterns(self):
-        """Test Surface to base Aurora migration patterns."""
-        # Test cases: (source_image, expected_target)
-        surface_test_cases = [
-            (
-                "ghcr.io/ublue-os/aurora-surface:stable",
-                "ghcr.io/ublue-os/aurora:stable",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-surface-nvidia:latest",
-                "ghcr.io/ublue-os/aurora-nvidia:latest",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-surface-nvidia-open:stable-daily",
-                "ghcr.io/ublue-os/aurora-nvidia-open:stable-daily",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-dx-surface:42",
-                "ghcr.io/ublue-os/aurora-dx:42",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-dx-surface-nvidia:stable",
-                "ghcr.io/ublue-os/aurora-dx-nvidia:stable",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-dx-surface-nvidia-open:latest",
-                "ghcr.io/ublue-os/aurora-dx-nvidia-open:latest",
-            ),
-        ]
-
-        for source_image, expected_target in surface_test_cases:
-            with self.subTest(source=source_image, target=expected_target):
-                # Find the migration
-                migration = self.migrator.find_migration(source_image)
-                self.assertIsNotNone(
-                    migration, f"No migration found for {source_image}"
-                )
-                self.assertEqual(migration["name"], "Surface end-of-life")
-
-                # Test target image resolution
-                resolved_target = self.migrator._resolve_target_image(
-                    migration, source_image
-                )
-                self.assertEqual(
-                    resolved_target,
-                    expected_target,
-                    f"Expected {source_image} -> {expected_target}, got {resolved_target}",
-                )
-
-    def test_hwe_migration_patterns(self):
-        """Test HWE to base Aurora migration patterns."""
-        # Test cases: (source_image, expected_target)
-        hwe_test_cases = [
-            (
-                "ghcr.io/ublue-os/aurora-hwe:stable",
-                "ghcr.io/ublue-os/aurora:stable",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-hwe-nvidia:latest",
-                "ghcr.io/ublue-os/aurora-nvidia:latest",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-hwe-nvidia-open:stable-daily",
-                "ghcr.io/ublue-os/aurora-nvidia-open:stable-daily",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-dx-hwe:42",
-                "ghcr.io/ublue-os/aurora-dx:42",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-dx-hwe-nvidia:stable",
-                "ghcr.io/ublue-os/aurora-dx-nvidia:stable",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-dx-hwe-nvidia-open:latest",
-                "ghcr.io/ublue-os/aurora-dx-nvidia-open:latest",
-            ),
-        ]
-
-        for source_image, expected_target in hwe_test_cases:
-            with self.subTest(source=source_image, target=expected_target):
-                migration = self.migrator.find_migration(source_image)
-                self.assertIsNotNone(
-                    migration, f"No migration found for {source_image}"
-                )
-                self.assertEqual(migration["name"], "HWE end-of-life")
-
-                # Test target image resolution
-                resolved_target = self.migrator._resolve_target_image(
-                    migration, source_image
-                )
-                self.assertEqual(
-                    resolved_target,
-                    expected_target,
-                    f"Expected {source_image} -> {expected_target}, got {resolved_target}",
-                )
-
-    def test_no_migration_for_base_images(self):
-        """Test that base Aurora images don't get migrated."""
-        # These images should NOT trigger any migration
-        non_matching_images = [
-            "ghcr.io/ublue-os/aurora:stable",
-            "ghcr.io/ublue-os/aurora-nvidia:latest",
-            "ghcr.io/ublue-os/aurora-nvidia-open:stable",
-            "ghcr.io/ublue-os/aurora-dx:42",
-            "ghcr.io/ublue-os/aurora-dx-nvidia:stable",
-            "ghcr.io/ublue-os/aurora-dx-nvidia-open:latest",
-            "ghcr.io/ublue-os/bluefin:stable",
-            "ghcr.io/ublue-os/bazzite:latest",
-        ]
-
-        for image in non_matching_images:
-            with self.subTest(image=image):
-                migration = self.migrator.find_migration(image)
-                self.assertIsNone(migration, f"Unexpected migration found for {image}")
-
-    def test_migration_with_different_tags(self):
-        """Test that migrations work with various image tags."""
-        test_cases = [
-            (
-                "ghcr.io/ublue-os/aurora-asus:stable-daily",
-                "ghcr.io/ublue-os/aurora:stable-daily",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-surface-nvidia:42",
-                "ghcr.io/ublue-os/aurora-nvidia:42",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-dx-hwe-nvidia:40-20240101",
-                "ghcr.io/ublue-os/aurora-dx-nvidia:40-20240101",
-            ),
-            (
-                "ghcr.io/ublue-os/aurora-hwe-nvidia-open:gts",
-                "ghcr.io/ublue-os/aurora-nvidia-open:gts",
-            ),
-        ]
-
-        for source_image, expected_target in test_cases:
-            with self.subTest(source=source_image, target=expected_target):
-                migration = self.migrator.find_migration(source_image)
-                self.assertIsNotNone(
-                    migration, f"No migration found for {source_image}"
-                )
-
-                resolved_target = self.migrator._resolve_target_image(
-                    migration, source_image
-                )
-                self.assertEqual(
-                    resolved_target,
-                    expected_target,
-                    f"Expected {source_image} -> {expected_target}, got {resolved_target}",
-                )
-
     def test_full_migration_execution(self):
         """Test complete migration execution for an ASUS image."""
         source_image = "ghcr.io/ublue-os/aurora-dx-asus-nvidia:stable"
@@ -444,35 +575,232 @@ class TestAuroraHWEMigrations(unittest.TestCase):
         )
 
 
-class TestNotificationManager(unittest.TestCase):
+_ASUS_CASES = (
+    (
+        "ghcr.io/ublue-os/aurora-asus:stable",
+        "ghcr.io/ublue-os/aurora:stable",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-asus-nvidia:latest",
+        "ghcr.io/ublue-os/aurora-nvidia:latest",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-asus-nvidia-open:stable-daily",
+        "ghcr.io/ublue-os/aurora-nvidia-open:stable-daily",
+    ),
+    ("ghcr.io/ublue-os/aurora-dx-asus:42", "ghcr.io/ublue-os/aurora-dx:42"),
+    (
+        "ghcr.io/ublue-os/aurora-dx-asus-nvidia:stable",
+        "ghcr.io/ublue-os/aurora-dx-nvidia:stable",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-dx-asus-nvidia-open:latest",
+        "ghcr.io/ublue-os/aurora-dx-nvidia-open:latest",
+    ),
+)
+
+_SURFACE_CASES = (
+    (
+        "ghcr.io/ublue-os/aurora-surface:stable",
+        "ghcr.io/ublue-os/aurora:stable",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-surface-nvidia:latest",
+        "ghcr.io/ublue-os/aurora-nvidia:latest",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-surface-nvidia-open:stable-daily",
+        "ghcr.io/ublue-os/aurora-nvidia-open:stable-daily",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-dx-surface:42",
+        "ghcr.io/ublue-os/aurora-dx:42",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-dx-surface-nvidia:stable",
+        "ghcr.io/ublue-os/aurora-dx-nvidia:stable",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-dx-surface-nvidia-open:latest",
+        "ghcr.io/ublue-os/aurora-dx-nvidia-open:latest",
+    ),
+)
+
+_HWE_CASES = (
+    (
+        "ghcr.io/ublue-os/aurora-hwe:stable",
+        "ghcr.io/ublue-os/aurora:stable",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-hwe-nvidia:latest",
+        "ghcr.io/ublue-os/aurora-nvidia:latest",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-hwe-nvidia-open:stable-daily",
+        "ghcr.io/ublue-os/aurora-nvidia-open:stable-daily",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-dx-hwe:42",
+        "ghcr.io/ublue-os/aurora-dx:42",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-dx-hwe-nvidia:stable",
+        "ghcr.io/ublue-os/aurora-dx-nvidia:stable",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-dx-hwe-nvidia-open:latest",
+        "ghcr.io/ublue-os/aurora-dx-nvidia-open:latest",
+    ),
+)
+
+_BASE_IMAGES = (
+    "ghcr.io/ublue-os/aurora:stable",
+    "ghcr.io/ublue-os/aurora-nvidia:latest",
+    "ghcr.io/ublue-os/aurora-nvidia-open:stable",
+    "ghcr.io/ublue-os/aurora-dx:42",
+    "ghcr.io/ublue-os/aurora-dx-nvidia:stable",
+    "ghcr.io/ublue-os/aurora-dx-nvidia-open:latest",
+    "ghcr.io/ublue-os/bluefin:stable",
+    "ghcr.io/ublue-os/bazzite:latest",
+)
+
+_TAGGED_CASES = (
+    (
+        "ghcr.io/ublue-os/aurora-asus:stable-daily",
+        "ghcr.io/ublue-os/aurora:stable-daily",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-surface-nvidia:42",
+        "ghcr.io/ublue-os/aurora-nvidia:42",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-dx-hwe-nvidia:40-20240101",
+        "ghcr.io/ublue-os/aurora-dx-nvidia:40-20240101",
+    ),
+    (
+        "ghcr.io/ublue-os/aurora-hwe-nvidia-open:gts",
+        "ghcr.io/ublue-os/aurora-nvidia-open:gts",
+    ),
+)
+
+
+def _assert_migration_target(migrator, source_image, expected_target, name=None):
+    """Check that an image has a migration resolving to the expected target."""
+    migration = migrator.find_migration(source_image)
+    assert migration is not None, f"No migration found for {source_image}"
+    if name is not None:
+        assert migration["name"] == name
+
+    resolved_target = migrator._resolve_target_image(migration, source_image)
+    assert (
+        resolved_target == expected_target
+    ), f"Expected {source_image} -> {expected_target}, got {resolved_target}"
+
+
+@pytest.mark.parametrize("source_image,expected_target", _ASUS_CASES)
+def test_asus_migration_patterns(aurora_migrator, source_image, expected_target):
+    """Test ASUS to base Aurora migration patterns."""
+    _assert_migration_target(
+        aurora_migrator, source_image, expected_target, "ASUS end-of-life"
+    )
+
+
+@pytest.mark.parametrize("source_image,expected_target", _SURFACE_CASES)
+def test_surface_migration_patterns(aurora_migrator, source_image, expected_target):
+    """Test Surface to base Aurora migration patterns."""
+    _assert_migration_target(
+        aurora_migrator, source_image, expected_target, "Surface end-of-life"
+    )
+
+
+@pytest.mark.parametrize("source_image,expected_target", _HWE_CASES)
+def test_hwe_migration_patterns(aurora_migrator, source_image, expected_target):
+    """Test HWE to base Aurora migration patterns."""
+    _assert_migration_target(
+        aurora_migrator, source_image, expected_target, "HWE end-of-life"
+    )
+
+
+@pytest.mark.parametrize("image", _BASE_IMAGES)
+def test_no_migration_for_base_images(aurora_migrator, image):
+    """Test that base Aurora images don't get migrated."""
+    migration = aurora_migrator.find_migration(image)
+    assert migration is None, f"Unexpected migration found for {image}"
+
+
+@pytest.mark.parametrize("source_image,expected_target", _TAGGED_CASES)
+def test_migration_with_different_tags(aurora_migrator, source_image, expected_target):
+    """Test that migrations work with various image tags."""
+    _assert_migration_target(aurora_migrator, source_image, expected_target)
+
+
+class TestNotificationManager:
     """Test notification system."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.notification_manager = NotificationManager()
+    @classmethod
+    def setup_class(cls):
+        """Create one manager for the tests that don't exercise detection."""
+        cls.notification_manager = NotificationManager()
+
+    @pytest.fixture
+    def mock_popen(self, monkeypatch):
+        """Replace subprocess.Popen and force desktop notifications on."""
+        mock_popen = Mock()
+        monkeypatch.setattr("subprocess.Popen", mock_popen)
+        monkeypatch.setattr(self.notification_manager, "desktop_available", True)
+        return mock_popen
 
-    @patch("subprocess.run")
-    def test_check_desktop_environment(self, mock_run):
+    def test_check_desktop_environment(self, monkeypatch):
         """Test desktop environment detection."""
-        # Mock successful desktop detection
-        mock_result = Mock()
-        mock_result.stdout = "x11"
-        mock_run.return_value = mock_result
+        mock_run = Mock()
+        mock_which = Mock(return_value="/usr/bin/notify-send")
+        monkeypatch.setattr("subprocess.run", mock_run)
+        monkeypatch.setattr("shutil.which", mock_which)
+        monkeypatch.setattr(
+            NotificationManager, "_get_active_user_session", lambda self: None
+        )
 
-        # Create new instance to trigger detection
+        # Mock successful desktop detection
         nm = NotificationManager()
-        # The actual detection result depends on the mocked subprocess calls
+        assert nm.desktop_available
+        assert nm._notify_send_path == "/usr/bin/notify-send"
+
+        mock_which.return_value = None
+        assert not NotificationManager().desktop_available
+
+        # Detection looks tools up on PATH without spawning `which`
+        mock_run.assert_not_called()
 
-    @patch("subprocess.run")
-    def test_send_desktop_notification(self, mock_run):
+    def test_send_desktop_notification(self, mock_popen):
         """Test desktop notification sending."""
-        self.notification_manager.desktop_available = True
         self.notification_manager._send_desktop_notification(
             "Test Title", "Test Message"
         )
 
         # Should attempt to run notify-send
-        mock_run.assert_called()
+        mock_popen.assert_called()
+        cmd = mock_popen.call_args.args[0]
+        assert "notify-send" in cmd[cmd.index("--app-name=EOL Rebaser") - 1]
+
+    def test_dispatch_notifications_does_not_wait(self, mock_popen):
+        """Test that notification commands are started without blocking."""
+        self.notification_manager.notify_migration_success(
+            "Test Migration", "new/image:latest"
+        )
+
+        commands = [call.args[0] for call in mock_popen.call_args_list]
+        assert len(commands) == 3
+        assert ["wall"] in commands
+        mock_popen.return_value.communicate.assert_not_called()
+
+    def test_spawn_closes_stdin_on_broken_pipe(self, mock_popen):
+        """Test that stdin is closed when the command exits before reading it."""
+        stdin = mock_popen.return_value.stdin
+        stdin.write.side_effect = BrokenPipeError
+
+        self.notification_manager._spawn(["wall"], timeout=10, input=b"message")
+
+        stdin.close.assert_called_once()
 
     def test_notify_migration_start(self):
         """Test migration start notification."""
@@ -482,5 +810,52 @@ class TestNotificationManager(unittest.TestCase):
         )
 
 
-if __name__ == "__main__":
-    unittest.main()
+class TestMain:
+    """Test the command line entry point."""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, monkeypatch, tmp_path):
+        """Run main() against a test config with stubbed managers."""
+        config_path = tmp_path / "test_config.yaml"
+        config_path.write_bytes(_VALID_CONFIG)
+        self.argv = ["eol-rebaser", "--config", str(config_path), "--check"]
+
+        self.mock_bootc = _StubBootc()
+        self.mock_bootc.get_current_image.return_value = "test/image:bootc"
+        monkeypatch.setattr(
+            "eol_rebaser.bootc.BootcManager", Mock(return_value=self.mock_bootc)
+        )
+        monkeypatch.setattr(
+            "eol_rebaser.notifications.NotificationManager",
+            Mock(return_value=_StubNotifications()),
+        )
+        self.monkeypatch = monkeypatch
+
+    def _run(self, *args):
+        """Run main() with extra arguments and return its exit code."""
+        self.monkeypatch.setattr("sys.argv", self.argv + list(args))
+        return main()
+
+    def test_current_image_from_environment_in_dry_run(self, capsys):
+        """Test that dry runs take the current image from the environment."""
+        self.monkeypatch.setenv("EOL_REBASER_CURRENT_IMAGE", "test/image:env")
+
+        assert self._run("--dry-run") == 0
+        assert "From: test/image:env" in capsys.readouterr().out
+        self.mock_bootc.get_current_image.assert_not_called()
+
+    def test_current_image_environment_ignored_without_dry_run(self, capsys):
+        """Test that the environment override only applies to dry runs."""
+        self.monkeypatch.setenv("EOL_REBASER_CURRENT_IMAGE", "test/image:env")
+
+        assert self._run() == 0
+        assert "From: test/image:bootc" in capsys.readouterr().out
+        self.mock_bootc.get_current_image.assert_called_once()
+
+    def test_empty_current_image_environment_uses_bootc(self, capsys):
+        """Test that an empty override falls back to asking bootc."""
+        self.monkeypatch.setenv("EOL_REBASER_CURRENT_IMAGE", "")
+
+        assert self._run("--dry-run") == 0
+        assert "From: test/image:bootc" in capsys.readouterr().out
+        self.mock_bootc.get_current_image.assert_called_once()